@@ -1,7 +1,7 @@
-from dataclasses import asdict, dataclass
-from dacite import from_dict
-from typing import Optional
+from dataclasses import dataclass
+from typing import Mapping, Optional, TypedDict, Union
 
+import msgspec
 import requests 
 import json
 import pandas as pd 
@@ -11,33 +11,27 @@ class CoinGeckoEndpoint:
     api: str
     endpoint: str
 
-@dataclass
-class CoinGeckoMarketChartState:
+class CoinGeckoMarketChartState(TypedDict, total=False):
     asset_id: Optional[list[str]]
 
-@dataclass
-class CoinGeckoState:
+class CoinGeckoState(TypedDict, total=False):
     api: Optional[str]
     marketchart_state: Optional[CoinGeckoMarketChartState]
     last_query_time: Optional[str]
 
-@dataclass 
-class CoinMarketParameters:
+class CoinMarketParameters(msgspec.Struct):
     vs_currency: str
     order: str
     per_page: str
 
-@dataclass 
-class MarketChartParameters:
+class MarketChartParameters(msgspec.Struct):
     vs_currency: str
 
-@dataclass 
-class APIBaseParameters:
+class APIBaseParameters(msgspec.Struct):
     coinmarkets: CoinMarketParameters
     marketchart: MarketChartParameters
 
-@dataclass
-class CoinGeckoSecrets:
+class CoinGeckoSecrets(msgspec.Struct):
     base_url: str
 
 class CoinGeckoAPI:
@@ -50,16 +44,33 @@ class CoinGeckoAPI:
         API_KEY_MARKET_CHART: CoinGeckoEndpoint(API_KEY_MARKET_CHART, "marketchart")
     }
 
-    def __init__(self, state: dict, secrets: dict) -> None:
+    def __init__(self, state: Mapping, secrets: Union[Mapping, CoinGeckoSecrets]) -> None:
         self.parse_request(state, secrets)
 
-    def parse_request(self, state: dict, secrets: dict):
-        self.original_state: CoinGeckoState = from_dict(data_class=CoinGeckoState, data=state)
-        self.updated_state: dict = asdict(self.original_state)
-        self.secrets: CoinGeckoSecrets = from_dict(data_class=CoinGeckoSecrets, data=secrets)
+    def parse_request(self, state: Mapping, secrets: Union[Mapping, CoinGeckoSecrets]):
+        # msgspec only converts plain dicts into a TypedDict, so read-only mappings are copied first
+        state = dict(state)
+        if isinstance(state.get("marketchart_state"), Mapping):
+            state["marketchart_state"] = dict(state["marketchart_state"])
+        self.original_state: CoinGeckoState = msgspec.convert(state, CoinGeckoState)
+
+        # Shallow copy - only the levels and lists that get written to are copied, so original_state stays a snapshot.
+        # Missing keys are filled with None so the saved state always has the full shape
+        self.updated_state: dict = {key: self.original_state.get(key) for key in CoinGeckoState.__annotations__}
+        if self.original_state.get("marketchart_state") is not None:
+            self.updated_state["marketchart_state"] = {
+                key: self.original_state["marketchart_state"].get(key) for key in CoinGeckoMarketChartState.__annotations__
+            }
+            if self.updated_state["marketchart_state"]["asset_id"] is not None:
+                self.updated_state["marketchart_state"]["asset_id"] = list(self.updated_state["marketchart_state"]["asset_id"])
+        # Already parsed secrets are reused as is, so callers can decode them once and share them
+        self.secrets: CoinGeckoSecrets = secrets if isinstance(secrets, CoinGeckoSecrets) else msgspec.convert(secrets, CoinGeckoSecrets)
+
+    def get_updated_state(self) -> dict:
+        return msgspec.to_builtins(self.updated_state)
 
     def build_api(self) -> str:
-        api = self.API_ENDPOINTS[self.API_KEY_COIN_MARKETS] if self.original_state.api is None else self.API_ENDPOINTS[self.original_state.api]
+        api = self.API_ENDPOINTS[self.API_KEY_COIN_MARKETS] if self.original_state.get("api") is None else self.API_ENDPOINTS[self.original_state["api"]]
 
         # TODO - build default parameters for coin markets endpoint
         # Parameters for Coin Markets endpoint will not be configurable 
@@ -68,7 +79,7 @@ class CoinGeckoAPI:
             pass
         
         elif api.api == self.API_KEY_MARKET_CHART:
-            if self.original_state.marketchart_state is None:
+            if self.original_state.get("marketchart_state") is None:
                 existing_asset_id = None 
             else:
-                existing_asset_id = self.original_state.marketchart_state.asset_id
\ No newline at end of file
+                existing_asset_id = self.original_state["marketchart_state"].get("asset_id")
\ No newline at end of file
@@ -1,21 +1,108 @@
+from types import MappingProxyType
+
+import msgspec
 import pytest 
 import coingecko_api
 
-BASIC_SECRETS = {
+# Read-only so a test that mutates these fails instead of leaking into later tests in the same process
+BASIC_SECRETS = MappingProxyType({
     'base_url': 'https://api.coingecko.com/api/v3/'
-}
+})
 
-BASIC_PARAMETERS = {
-    "coinmarkets": {
+BASIC_PARAMETERS = MappingProxyType({
+    "coinmarkets": MappingProxyType({
         "vs_currency": "usd",
         "order": "market_cap_des",
         "per_page": "300"
-    },
+    }),
 
-    "marketchart": {
+    "marketchart": MappingProxyType({
         "vs_currency": "usd"
+    })
+})
+
+BASIC_STATE = MappingProxyType({})
+
+BASIC_MARKETCHART_STATE = MappingProxyType({
+    "api": "marketchart",
+    "marketchart_state": MappingProxyType({"asset_id": ("bitcoin",)})
+})
+
+
+@pytest.fixture(scope="session")
+def parsed_secrets():
+    return msgspec.convert(BASIC_SECRETS, coingecko_api.CoinGeckoSecrets)
+
+@pytest.fixture
+def fresh_api(parsed_secrets):
+    # New instance per test so updated_state is never shared, the secrets are decoded once per session
+    def make_api(state=BASIC_STATE):
+        return coingecko_api.CoinGeckoAPI(state, parsed_secrets)
+
+    return make_api
+
+
+def test_parse_request_accepts_read_only_state(fresh_api):
+    api = fresh_api(BASIC_MARKETCHART_STATE)
+
+    assert api.original_state == {"api": "marketchart", "marketchart_state": {"asset_id": ["bitcoin"]}}
+
+def test_updated_state_fills_missing_keys_with_none(fresh_api):
+    api = fresh_api({})
+
+    assert api.get_updated_state() == {"api": None, "marketchart_state": None, "last_query_time": None}
+
+def test_updated_state_fills_missing_marketchart_keys_with_none(fresh_api):
+    api = fresh_api({"marketchart_state": {}})
+
+    assert api.get_updated_state()["marketchart_state"] == {"asset_id": None}
+
+def test_get_updated_state_returns_copy(fresh_api):
+    api = fresh_api(BASIC_MARKETCHART_STATE)
+
+    result = api.get_updated_state()
+    result["api"] = "coinmarkets"
+    result["marketchart_state"]["asset_id"].append("ethereum")
+
+    assert api.get_updated_state() == {
+        "api": "marketchart",
+        "marketchart_state": {"asset_id": ["bitcoin"]},
+        "last_query_time": None
     }
-}
 
-BASIC_STATE = {}
+def test_updating_state_leaves_original_state_unchanged(fresh_api):
+    api = fresh_api(BASIC_MARKETCHART_STATE)
+
+    api.updated_state["api"] = "coinmarkets"
+    api.updated_state["marketchart_state"]["asset_id"].append("ethereum")
+
+    assert api.original_state == {"api": "marketchart", "marketchart_state": {"asset_id": ["bitcoin"]}}
+
+def test_parse_request_empty_state(fresh_api):
+    api = fresh_api()
+
+    assert api.original_state == {}
+
+def test_parse_request_partial_marketchart_state(fresh_api):
+    api = fresh_api({"marketchart_state": {"asset_id": ["bitcoin", "ethereum"]}})
+
+    assert api.original_state.get("api") is None
+    assert api.original_state["marketchart_state"]["asset_id"] == ["bitcoin", "ethereum"]
+
+def test_parse_request_rejects_wrongly_typed_field():
+    with pytest.raises(msgspec.ValidationError):
+        coingecko_api.CoinGeckoAPI({"api": 3}, BASIC_SECRETS)
+
+    with pytest.raises(msgspec.ValidationError):
+        coingecko_api.CoinGeckoAPI({"marketchart_state": {"asset_id": "bitcoin"}}, BASIC_SECRETS)
+
+def test_parse_request_decodes_secrets():
+    api = coingecko_api.CoinGeckoAPI(BASIC_STATE, BASIC_SECRETS)
+
+    assert api.secrets == coingecko_api.CoinGeckoSecrets(base_url="https://api.coingecko.com/api/v3/")
+
+    with pytest.raises(msgspec.ValidationError):
+        coingecko_api.CoinGeckoAPI(BASIC_STATE, {})
 
+def test_parse_request_reuses_parsed_secrets(fresh_api, parsed_secrets):
+    assert fresh_api().secrets is parsed_secrets